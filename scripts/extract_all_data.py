@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Run both Region 9 extraction scripts and, with --watch, keep the generated
+TypeScript files in sync as County Data Tables workbooks land in DATA_DIR.
+
+In watch mode the data folder is monitored (native filesystem events via the
+optional `watchdog` package, polling otherwise). Bursts of saves are
+debounced, only the counties whose workbooks changed are re-extracted (each
+workbook is parsed once for both outputs), and a lib/data/region9-*.ts file
+is only rewritten when its data actually changed.
+
+Usage:
+    python3 scripts/extract_all_data.py
+    python3 scripts/extract_all_data.py --watch
+"""
+
+import argparse
+import json
+import queue
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import pandas as pd
+
+import extract_comprehensive_data
+import extract_historical_data
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+# Generated outputs, keyed by output file name
+EXTRACTORS = {
+    "region9-comprehensive.ts": extract_comprehensive_data,
+    "region9-historical.ts": extract_historical_data,
+}
+
+COUNTIES = extract_historical_data.COUNTIES
+
+# Generated files live in this checkout's lib/data
+REPO_OUTPUT_DIR = Path(__file__).resolve().parent.parent / "lib" / "data"
+
+# Attempts at a county that keeps failing before waiting for its next save
+MAX_RETRIES = 5
+
+# watchdog event types that can mean a workbook's contents changed; opened and
+# closed_no_write fire for our own reads and must not requeue the county
+WRITE_EVENT_TYPES = {"created", "modified", "moved", "deleted", "closed"}
+
+def workbook_name(county_name: str) -> str:
+    """File name of a county's data tables workbook"""
+    return f"{county_name} County Data Tables.xlsx"
+
+def county_for_path(path: Path) -> Optional[str]:
+    """Map a workbook path back to its county, or None if it isn't one"""
+    for county in COUNTIES:
+        if path.name == workbook_name(county):
+            return county
+    return None
+
+def configure_paths(data_dir: Path, output_dir: Path):
+    """Point both extraction modules at different data and output folders"""
+    for module in EXTRACTORS.values():
+        module.DATA_DIR = data_dir
+        module.OUTPUT_DIR = output_dir
+
+def stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime, size) of a file, or None if it doesn't exist"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def has_values(value) -> bool:
+    """True if an extracted field holds any actual data"""
+    if isinstance(value, dict):
+        return any(has_values(v) for v in value.values())
+    if isinstance(value, list):
+        return len(value) > 0
+    return value is not None
+
+def is_empty_extraction(data: Dict[str, Any]) -> bool:
+    """True if every sheet came back empty (e.g. an unreadable workbook)"""
+    return not any(has_values(v) for k, v in data.items() if k != "county")
+
+# ============================================================================
+# INCREMENTAL EXTRACTION
+# ============================================================================
+
+class IncrementalExtractor:
+    """Caches per-county extractions so a change only re-reads one workbook"""
+
+    def __init__(self):
+        # output name -> county -> data already written to disk
+        self.cache: Dict[str, Dict[str, dict]] = {name: {} for name in EXTRACTORS}
+        # output name -> county -> changed data not yet written
+        self.staged: Dict[str, Dict[str, dict]] = {name: {} for name in EXTRACTORS}
+
+    def extract_county(self, county_name: str) -> Dict[str, dict]:
+        """Extract a county for every output without touching the cache"""
+        file_path = extract_historical_data.DATA_DIR / workbook_name(county_name)
+        before = stat_signature(file_path)
+
+        # Parse the workbook once and share it between both extractors
+        try:
+            workbook = pd.ExcelFile(file_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ValueError(f"{file_path.name} is incomplete or still being saved") from e
+
+        results = {}
+        with workbook:
+            for name, module in EXTRACTORS.items():
+                data = module.extract_all_county_data(county_name, workbook)
+                previous = self.staged[name].get(county_name, self.cache[name].get(county_name))
+                if previous is not None and is_empty_extraction(data) and not is_empty_extraction(previous):
+                    raise ValueError(f"{name} extraction came back empty")
+                results[name] = data
+
+        if stat_signature(file_path) != before:
+            raise ValueError(f"{file_path.name} changed while it was being read")
+        return results
+
+    def write_outputs(self) -> Set[str]:
+        """Write every output with staged changes; return counties left unwritten"""
+        unwritten: Set[str] = set()
+        for name, updates in self.staged.items():
+            if not updates:
+                continue
+            merged = {**self.cache[name], **updates}
+            missing = [county for county in COUNTIES if county not in merged]
+            if missing:
+                print(f"  Holding {name} until data is extracted for: {', '.join(missing)}")
+                continue
+            try:
+                EXTRACTORS[name].generate_typescript_file([merged[c] for c in COUNTIES])
+            except Exception as e:
+                print(f"Warning: Could not write {name}: {e}")
+                unwritten.update(updates)
+                continue
+            self.cache[name] = merged
+            self.staged[name] = {}
+        return unwritten
+
+    def run(self, counties: Iterable[str]) -> Set[str]:
+        """Re-extract the given counties and write only affected outputs.
+
+        Returns the counties that failed and should be retried.
+        """
+        failed: Set[str] = set()
+        for county in sorted(counties):
+            start = time.monotonic()
+            try:
+                results = self.extract_county(county)
+            except Exception as e:
+                print(f"Warning: Could not extract {county}: {e}")
+                failed.add(county)
+                continue
+
+            for name, data in results.items():
+                previous = self.cache[name].get(county)
+                # Compare serialized form so NaN values don't register as changes
+                if previous is None or json.dumps(previous) != json.dumps(data):
+                    self.staged[name][county] = data
+                else:
+                    self.staged[name].pop(county, None)
+            print(f"  ✓ {county} extracted in {time.monotonic() - start:.1f}s")
+
+        if not any(self.staged.values()):
+            if not failed:
+                print("  No data changes; outputs left untouched")
+            return failed
+        return failed | self.write_outputs()
+
+# ============================================================================
+# FILE WATCHING
+# ============================================================================
+
+def is_workbook(path: Path) -> bool:
+    """True for .xlsx files, skipping Excel's ~$ lock files"""
+    return path.suffix.lower() == ".xlsx" and not path.name.startswith("~$")
+
+def scan_workbooks(data_dir: Path) -> Dict[Path, Tuple[int, int]]:
+    """(mtime, size) of every workbook currently in the data folder"""
+    snapshot = {}
+    for path in data_dir.glob("*.xlsx"):
+        signature = stat_signature(path)
+        if is_workbook(path) and signature is not None:
+            snapshot[path] = signature
+    return snapshot
+
+class PollingWatcher:
+    """Detects workbook changes by comparing mtime and size between polls"""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.snapshot = scan_workbooks(data_dir)
+
+    def poll(self) -> Set[Path]:
+        current = scan_workbooks(self.data_dir)
+        changed = {
+            path for path in current.keys() | self.snapshot.keys()
+            if current.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = current
+        return changed
+
+    def stop(self):
+        pass
+
+class EventWatcher:
+    """Collects workbook change events from watchdog's native observer"""
+
+    def __init__(self, data_dir: Path):
+        self.events: "queue.Queue[Path]" = queue.Queue()
+        events = self.events
+        # Backends differ in which events a plain read produces, so only
+        # report a workbook once its mtime or size has actually moved
+        signatures = scan_workbooks(data_dir)
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory or event.event_type not in WRITE_EVENT_TYPES:
+                    return
+                for attr in ("src_path", "dest_path"):
+                    path = getattr(event, attr, None)
+                    if not path or not is_workbook(Path(path)):
+                        continue
+                    path = Path(path)
+                    signature = stat_signature(path)
+                    if signatures.get(path) == signature:
+                        continue
+                    signatures[path] = signature
+                    events.put(path)
+
+        self.observer = Observer()
+        self.observer.schedule(Handler(), str(data_dir), recursive=False)
+        self.observer.start()
+
+    @property
+    def backend(self) -> str:
+        return type(self.observer).__name__
+
+    def poll(self) -> Set[Path]:
+        changed = set()
+        while True:
+            try:
+                changed.add(self.events.get_nowait())
+            except queue.Empty:
+                return changed
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+
+def start_watcher(data_dir: Path, interval: float, use_polling: bool):
+    """Start watching DATA_DIR; return the watcher and a description of it"""
+    if Observer is not None and not use_polling:
+        watcher = EventWatcher(data_dir)
+        return watcher, f"native events via {watcher.backend}"
+    return PollingWatcher(data_dir), f"polling every {interval}s"
+
+class ChangeQueue:
+    """Debounces changed counties and tracks retries of ones that fail"""
+
+    def __init__(self, debounce: float, retry: Iterable[str] = ()):
+        self.debounce = debounce
+        self.pending: Set[str] = set(retry)
+        # The initial full run counts as the first attempt
+        self.attempts: Dict[str, int] = {county: 1 for county in self.pending}
+        self.last_change = time.monotonic()
+
+    def changed(self, county: str):
+        """Record a save; a fresh save resets the county's retry budget"""
+        self.pending.add(county)
+        self.attempts[county] = 0
+        self.last_change = time.monotonic()
+
+    def take(self) -> Set[str]:
+        """Counties ready to re-extract, once saves have been quiet long enough"""
+        if not self.pending or time.monotonic() - self.last_change < self.debounce:
+            return set()
+        counties, self.pending = self.pending, set()
+        return counties
+
+    def failed(self, county: str) -> bool:
+        """Requeue a failed county; False once it has used up its retries"""
+        self.attempts[county] = self.attempts.get(county, 0) + 1
+        if self.attempts[county] >= MAX_RETRIES:
+            return False
+        self.pending.add(county)
+        self.last_change = time.monotonic()
+        return True
+
+def watch(extractor: IncrementalExtractor, watcher, data_dir: Path, interval: float,
+          debounce: float, retry: Set[str]):
+    """Re-extract counties once their saves settle, retrying failed ones"""
+    changes = ChangeQueue(debounce, retry)
+
+    try:
+        while True:
+            time.sleep(interval)
+
+            for path in watcher.poll():
+                county = county_for_path(path)
+                if county is not None:
+                    changes.changed(county)
+
+            counties = changes.take()
+            if not counties:
+                continue
+
+            # A workbook removed mid-save will come back; keep the cached data
+            missing = {c for c in counties if not (data_dir / workbook_name(c)).exists()}
+            for county in missing:
+                print(f"Warning: {workbook_name(county)} is missing, keeping previous data")
+
+            counties -= missing
+            if not counties:
+                continue
+
+            print(f"\nChange detected: {', '.join(sorted(counties))}")
+            for county in extractor.run(counties):
+                if not changes.failed(county):
+                    print(f"Warning: Giving up on {county} until its workbook is saved again")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.stop()
+
+def main():
+    """Main extraction process"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-extract counties as workbooks change")
+    parser.add_argument("--data-dir", type=Path, default=extract_historical_data.DATA_DIR,
+                        help="folder containing the County Data Tables workbooks")
+    parser.add_argument("--output-dir", type=Path, default=REPO_OUTPUT_DIR,
+                        help="folder for the generated region9-*.ts files (default: lib/data)")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between checks for changes (default: 1)")
+    parser.add_argument("--debounce", type=float, default=3.0,
+                        help="seconds a workbook must be quiet before re-extracting (default: 3)")
+    parser.add_argument("--poll", action="store_true",
+                        help="use polling even if watchdog is installed")
+    args = parser.parse_args()
+
+    configure_paths(args.data_dir, args.output_dir)
+
+    # Start watching before the full run so saves made during it aren't missed
+    watcher = None
+    if args.watch:
+        watcher, mode = start_watcher(args.data_dir, args.interval, args.poll)
+
+    print("=" * 70)
+    print("Region 9 Data Extraction")
+    print("=" * 70)
+
+    extractor = IncrementalExtractor()
+    failed = extractor.run(COUNTIES)
+
+    print("\n" + "=" * 70)
+    print("Extraction complete!" if not failed else f"Extraction failed for: {', '.join(sorted(failed))}")
+    print("=" * 70)
+
+    if watcher is None:
+        if failed:
+            raise SystemExit(1)
+        return
+
+    print(f"\nWatching {args.data_dir} ({mode}, {args.debounce}s debounce). Ctrl+C to stop.")
+    watch(extractor, watcher, args.data_dir, args.interval, args.debounce, failed)
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ to complete the Region 9 HNA Dashboard.
 
 import pandas as pd
 import json
+import os
 from pathlib import Path
 from typing import Dict, List, Any
 
@@ -54,9 +55,9 @@ def clean_number(value):
 # ECONOMIC DATA EXTRACTION
 # ============================================================================
 
-def extract_wages_by_sector(county_name: str) -> List[Dict[str, Any]]:
+def extract_wages_by_sector(county_name: str, workbook=None) -> List[Dict[str, Any]]:
     """Extract wages by sector from SDO Jobs and Wage sheet"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='SDO Jobs and Wage', header=4)
@@ -87,9 +88,9 @@ def extract_wages_by_sector(county_name: str) -> List[Dict[str, Any]]:
         print(f"Warning: Could not extract wage data for {county_name}: {e}")
         return []
 
-def extract_job_projections(county_name: str) -> List[Dict[str, Any]]:
+def extract_job_projections(county_name: str, workbook=None) -> List[Dict[str, Any]]:
     """Extract job projections by sector from SDO Job Projections sheet"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='SDO Job Projections', header=4)
@@ -127,9 +128,9 @@ def extract_job_projections(county_name: str) -> List[Dict[str, Any]]:
 # DEMOGRAPHIC DATA EXTRACTION
 # ============================================================================
 
-def extract_age_distribution(county_name: str) -> Dict[str, Any]:
+def extract_age_distribution(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract age distribution time-series from SDO Age Distribution sheet"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='SDO Age Distribution', header=4)
@@ -178,9 +179,9 @@ def extract_age_distribution(county_name: str) -> Dict[str, Any]:
 # COMMUTING DATA EXTRACTION
 # ============================================================================
 
-def extract_commute_county(county_name: str) -> List[Dict[str, Any]]:
+def extract_commute_county(county_name: str, workbook=None) -> List[Dict[str, Any]]:
     """Extract where residents work (county level) from ACS Commute County"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='ACS Commute County', header=4)
@@ -212,9 +213,9 @@ def extract_commute_county(county_name: str) -> List[Dict[str, Any]]:
 # HOUSING QUALITY DATA EXTRACTION
 # ============================================================================
 
-def extract_year_built(county_name: str) -> Dict[str, Any]:
+def extract_year_built(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract housing by year built from ACS Tenure by Year Built"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='ACS Tenure by Year Built', header=4)
@@ -239,9 +240,9 @@ def extract_year_built(county_name: str) -> Dict[str, Any]:
         print(f"Warning: Could not extract year built data for {county_name}: {e}")
         return {}
 
-def extract_overcrowding(county_name: str) -> Dict[str, Any]:
+def extract_overcrowding(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract overcrowding rates from ACS Tenure by Overcrowding"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='ACS Tenure by Overcrowding', header=4)
@@ -264,9 +265,9 @@ def extract_overcrowding(county_name: str) -> Dict[str, Any]:
         print(f"Warning: Could not extract overcrowding data for {county_name}: {e}")
         return {}
 
-def extract_unit_types(county_name: str) -> Dict[str, Any]:
+def extract_unit_types(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract unit types from ACS Tenure by Units"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='ACS Tenure by Units', header=4)
@@ -293,9 +294,9 @@ def extract_unit_types(county_name: str) -> Dict[str, Any]:
 # INCOME & AFFORDABILITY DATA EXTRACTION
 # ============================================================================
 
-def extract_income_categories(county_name: str) -> Dict[str, Any]:
+def extract_income_categories(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract income distribution from ACS Income Categories"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='ACS Income Categories', header=4)
@@ -325,20 +326,23 @@ def extract_income_categories(county_name: str) -> Dict[str, Any]:
 # MAIN EXTRACTION FUNCTION
 # ============================================================================
 
-def extract_all_county_data(county_name: str) -> Dict[str, Any]:
-    """Extract all comprehensive data for a county"""
+def extract_all_county_data(county_name: str, workbook=None) -> Dict[str, Any]:
+    """Extract all comprehensive data for a county.
+
+    Pass an open pd.ExcelFile as workbook to read every sheet from one parse.
+    """
     print(f"\nExtracting comprehensive data for {county_name}...")
 
     return {
         "county": county_name,
-        "wagesBySector": extract_wages_by_sector(county_name),
-        "jobProjections": extract_job_projections(county_name),
-        "ageDistribution": extract_age_distribution(county_name),
-        "commuteCounty": extract_commute_county(county_name),
-        "yearBuilt": extract_year_built(county_name),
-        "overcrowding": extract_overcrowding(county_name),
-        "unitTypes": extract_unit_types(county_name),
-        "incomeCategories": extract_income_categories(county_name)
+        "wagesBySector": extract_wages_by_sector(county_name, workbook),
+        "jobProjections": extract_job_projections(county_name, workbook),
+        "ageDistribution": extract_age_distribution(county_name, workbook),
+        "commuteCounty": extract_commute_county(county_name, workbook),
+        "yearBuilt": extract_year_built(county_name, workbook),
+        "overcrowding": extract_overcrowding(county_name, workbook),
+        "unitTypes": extract_unit_types(county_name, workbook),
+        "incomeCategories": extract_income_categories(county_name, workbook)
     }
 
 def generate_typescript_file(all_data: List[Dict[str, Any]]):
@@ -346,7 +350,10 @@ def generate_typescript_file(all_data: List[Dict[str, Any]]):
 
     output_file = OUTPUT_DIR / "region9-comprehensive.ts"
 
-    with open(output_file, 'w') as f:
+    # Write to a temp file and swap it in so `next dev` never sees a partial file
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+
+    with open(tmp_file, 'w') as f:
         f.write("""/**
  * Region 9 Comprehensive Data
  *
@@ -413,6 +420,8 @@ export const REGION_9_COMPREHENSIVE_DATA: CountyComprehensiveData[] =
         f.write(json.dumps(all_data, indent=2))
         f.write(";\n")
 
+    os.replace(tmp_file, output_file)
+
     print(f"\n✓ Generated TypeScript file: {output_file}")
 
 def main():
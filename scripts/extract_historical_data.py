@@ -10,6 +10,7 @@ complete time-series data.
 
 import pandas as pd
 import json
+import os
 from pathlib import Path
 from typing import Dict, List, Any
 
@@ -26,9 +27,9 @@ COUNTIES = [
     "San Juan County"
 ]
 
-def extract_population_data(county_name: str) -> Dict[str, Any]:
+def extract_population_data(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract population historical data from SDO Population sheet"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     # Read population data (header at row 4, data starts at row 5)
     df = pd.read_excel(file_path, sheet_name='SDO Population', header=4)
@@ -52,9 +53,9 @@ def extract_population_data(county_name: str) -> Dict[str, Any]:
 
     return population_data
 
-def extract_household_data(county_name: str) -> Dict[str, Any]:
+def extract_household_data(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract household historical data from SDO Household Estimate"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         # Read household estimate data (header at row 4)
@@ -82,9 +83,9 @@ def extract_household_data(county_name: str) -> Dict[str, Any]:
         print(f"Warning: Could not extract household data for {county_name}: {e}")
         return {}
 
-def extract_household_projections(county_name: str) -> Dict[str, Any]:
+def extract_household_projections(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract household projection data from SDO Household Projections"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='SDO Household Projections', header=4)
@@ -109,9 +110,9 @@ def extract_household_projections(county_name: str) -> Dict[str, Any]:
         print(f"Warning: Could not extract household projections for {county_name}: {e}")
         return {}
 
-def extract_jobs_data(county_name: str) -> Dict[str, Any]:
+def extract_jobs_data(county_name: str, workbook=None) -> Dict[str, Any]:
     """Extract jobs historical data from SDO Jobs by Sector Estimates"""
-    file_path = DATA_DIR / f"{county_name} County Data Tables.xlsx"
+    file_path = workbook if workbook is not None else DATA_DIR / f"{county_name} County Data Tables.xlsx"
 
     try:
         df = pd.read_excel(file_path, sheet_name='SDO Jobs by Sector Estimates', header=4)
@@ -138,14 +139,17 @@ def extract_jobs_data(county_name: str) -> Dict[str, Any]:
         print(f"Warning: Could not extract jobs data for {county_name}: {e}")
         return {}
 
-def extract_all_county_data(county_name: str) -> Dict[str, Any]:
-    """Extract all historical time-series data for a county"""
+def extract_all_county_data(county_name: str, workbook=None) -> Dict[str, Any]:
+    """Extract all historical time-series data for a county.
+
+    Pass an open pd.ExcelFile as workbook to read every sheet from one parse.
+    """
     print(f"Extracting data for {county_name}...")
 
-    population = extract_population_data(county_name)
-    households_estimate = extract_household_data(county_name)
-    households_projection = extract_household_projections(county_name)
-    jobs = extract_jobs_data(county_name)
+    population = extract_population_data(county_name, workbook)
+    households_estimate = extract_household_data(county_name, workbook)
+    households_projection = extract_household_projections(county_name, workbook)
+    jobs = extract_jobs_data(county_name, workbook)
 
     # Merge household estimates and projections
     households = {**households_estimate, **households_projection}
@@ -162,7 +166,10 @@ def generate_typescript_file(all_data: List[Dict[str, Any]]):
 
     output_file = OUTPUT_DIR / "region9-historical.ts"
 
-    with open(output_file, 'w') as f:
+    # Write to a temp file and swap it in so `next dev` never sees a partial file
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+
+    with open(tmp_file, 'w') as f:
         f.write("""/**
  * Region 9 Historical Time-Series Data
  *
@@ -199,6 +206,8 @@ export const REGION_9_HISTORICAL_DATA: CountyHistoricalData[] = [
 
         f.write("];\n")
 
+    os.replace(tmp_file, output_file)
+
     print(f"\nGenerated TypeScript file: {output_file}")
 
 def main():
@@ -0,0 +1,210 @@
+"""
+Tests for the incremental extraction and watch-mode plumbing in
+extract_all_data.py, using small stand-in workbooks and extractor modules.
+
+Run with: python3 -m pytest scripts
+"""
+
+import time
+import zipfile
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import extract_all_data as ea
+
+def save_workbook(data_dir, county, value):
+    """Write a one-cell workbook for a county"""
+    path = data_dir / ea.workbook_name(county)
+    pd.DataFrame({"value": [value]}).to_excel(path, sheet_name="Data", index=False)
+    return path
+
+class FakeExtractor:
+    """Stands in for an extraction module, recording reads and writes"""
+
+    def __init__(self):
+        self.fail_extract = set()
+        self.fail_write = 0
+        self.extracted = []
+        self.written = []
+
+    def extract_all_county_data(self, county_name, workbook=None):
+        self.extracted.append(county_name)
+        if county_name in self.fail_extract:
+            raise RuntimeError("sheet unreadable")
+        value = pd.read_excel(workbook, sheet_name="Data")["value"].iloc[0]
+        return {"county": county_name, "value": None if value == "EMPTY" else value}
+
+    def generate_typescript_file(self, all_data):
+        if self.fail_write:
+            self.fail_write -= 1
+            raise OSError("disk full")
+        self.written.append({d["county"]: d["value"] for d in all_data})
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ea.extract_historical_data, "DATA_DIR", tmp_path)
+    for county in ea.COUNTIES:
+        save_workbook(tmp_path, county, "v1")
+    return tmp_path
+
+@pytest.fixture
+def fakes(monkeypatch):
+    fakes = {"comp": FakeExtractor(), "hist": FakeExtractor()}
+    monkeypatch.setattr(ea, "EXTRACTORS", fakes)
+    return fakes
+
+@pytest.fixture
+def extractor(data_dir, fakes):
+    extractor = ea.IncrementalExtractor()
+    assert extractor.run(ea.COUNTIES) == set()
+    for fake in fakes.values():
+        fake.extracted.clear()
+        fake.written.clear()
+    return extractor
+
+# ============================================================================
+# INCREMENTAL EXTRACTION
+# ============================================================================
+
+def test_full_run_writes_every_output(data_dir, fakes):
+    assert ea.IncrementalExtractor().run(ea.COUNTIES) == set()
+    for fake in fakes.values():
+        assert fake.written == [{county: "v1" for county in ea.COUNTIES}]
+
+def test_unchanged_workbook_writes_nothing(extractor, fakes):
+    assert extractor.run({"Dolores County"}) == set()
+    assert fakes["comp"].extracted == ["Dolores County"]
+    assert fakes["comp"].written == []
+    assert fakes["hist"].written == []
+
+def test_changed_county_only_rereads_that_county(extractor, fakes, data_dir):
+    save_workbook(data_dir, "Dolores County", "v2")
+    assert extractor.run({"Dolores County"}) == set()
+    for fake in fakes.values():
+        assert fake.extracted == ["Dolores County"]
+        assert fake.written[-1]["Dolores County"] == "v2"
+        assert fake.written[-1]["La Plata County"] == "v1"
+
+def test_later_extractor_failure_does_not_hide_change(extractor, fakes, data_dir):
+    save_workbook(data_dir, "Dolores County", "v2")
+    fakes["hist"].fail_extract.add("Dolores County")
+    assert extractor.run({"Dolores County"}) == {"Dolores County"}
+    assert fakes["comp"].written == []
+
+    fakes["hist"].fail_extract.clear()
+    assert extractor.run({"Dolores County"}) == set()
+    assert fakes["comp"].written[-1]["Dolores County"] == "v2"
+    assert fakes["hist"].written[-1]["Dolores County"] == "v2"
+
+def test_failed_write_is_retried(extractor, fakes, data_dir):
+    save_workbook(data_dir, "Dolores County", "v2")
+    fakes["comp"].fail_write = 1
+    assert extractor.run({"Dolores County"}) == {"Dolores County"}
+    assert fakes["hist"].written[-1]["Dolores County"] == "v2"
+
+    assert extractor.run({"Dolores County"}) == set()
+    assert fakes["comp"].written[-1]["Dolores County"] == "v2"
+
+def test_output_held_until_every_county_is_cached(data_dir, fakes):
+    extractor = ea.IncrementalExtractor()
+    fakes["comp"].fail_extract.add("San Juan County")
+    assert extractor.run(ea.COUNTIES) == {"San Juan County"}
+    assert fakes["comp"].written == []
+    assert fakes["hist"].written == []
+
+    fakes["comp"].fail_extract.clear()
+    assert extractor.run({"San Juan County"}) == set()
+    assert fakes["comp"].written == [{county: "v1" for county in ea.COUNTIES}]
+    assert fakes["hist"].written == [{county: "v1" for county in ea.COUNTIES}]
+
+def test_empty_extraction_does_not_replace_cached_data(extractor, fakes, data_dir):
+    save_workbook(data_dir, "La Plata County", "EMPTY")
+    assert extractor.run({"La Plata County"}) == {"La Plata County"}
+    assert fakes["comp"].written == []
+    assert extractor.cache["comp"]["La Plata County"]["value"] == "v1"
+
+def test_truncated_workbook_is_not_extracted(extractor, fakes, data_dir):
+    path = data_dir / ea.workbook_name("Montezuma County")
+    path.write_bytes(path.read_bytes()[:200])
+    assert extractor.run({"Montezuma County"}) == {"Montezuma County"}
+    assert fakes["comp"].extracted == []
+
+# ============================================================================
+# FILE WATCHING
+# ============================================================================
+
+def test_polling_watcher_reports_changes(tmp_path):
+    kept = save_workbook(tmp_path, "Dolores County", "v1")
+    removed = save_workbook(tmp_path, "San Juan County", "v1")
+    watcher = ea.PollingWatcher(tmp_path)
+    assert watcher.poll() == set()
+
+    kept.write_bytes(kept.read_bytes() + b"\0")
+    removed.unlink()
+    added = save_workbook(tmp_path, "La Plata County", "v1")
+    (tmp_path / "~$Dolores County County Data Tables.xlsx").write_bytes(b"lock")
+    assert watcher.poll() == {kept, removed, added}
+    assert watcher.poll() == set()
+
+def wait_for_events(watcher, timeout=2.0):
+    """Collect event-watcher changes until the observer goes quiet"""
+    changed = set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        changed |= watcher.poll()
+    return changed
+
+def test_event_watcher_ignores_reads(tmp_path):
+    pytest.importorskip("watchdog")
+    path = save_workbook(tmp_path, "Dolores County", "v1")
+    watcher = ea.EventWatcher(tmp_path)
+    try:
+        with zipfile.ZipFile(path) as workbook:
+            workbook.testzip()
+        with pd.ExcelFile(path) as workbook:
+            pd.read_excel(workbook, sheet_name="Data")
+        assert wait_for_events(watcher) == set()
+
+        save_workbook(tmp_path, "Dolores County", "v2")
+        assert wait_for_events(watcher) == {path}
+    finally:
+        watcher.stop()
+
+def test_change_queue_debounces_bursts(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ea.time, "monotonic", lambda: now[0])
+    changes = ea.ChangeQueue(debounce=3.0)
+
+    changes.changed("Dolores County")
+    now[0] += 2.0
+    changes.changed("Dolores County")
+    now[0] += 2.0
+    assert changes.take() == set()
+
+    now[0] += 1.0
+    assert changes.take() == {"Dolores County"}
+    assert changes.take() == set()
+
+def test_change_queue_gives_up_after_max_retries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ea.time, "monotonic", lambda: now[0])
+    changes = ea.ChangeQueue(debounce=1.0, retry={"San Juan County"})
+
+    for _ in range(ea.MAX_RETRIES - 2):
+        now[0] += 1.0
+        assert changes.take() == {"San Juan County"}
+        assert changes.failed("San Juan County")
+    now[0] += 1.0
+    assert changes.take() == {"San Juan County"}
+    assert not changes.failed("San Juan County")
+    now[0] += 1.0
+    assert changes.take() == set()
+
+    # A new save gives the county a fresh set of retries
+    changes.changed("San Juan County")
+    now[0] += 1.0
+    assert changes.take() == {"San Juan County"}
+    assert changes.failed("San Juan County")